@@ -3,9 +3,12 @@ Provide a simple user friendly API to PyTensor-managed memory.
 
 """
 
-import copy
+from __future__ import annotations
+
 from contextlib import contextmanager
-from typing import List, Optional
+from contextvars import ContextVar
+from copy import copy, deepcopy
+from functools import partial
 
 import numpy as np
 
@@ -15,20 +18,34 @@ from pytensor.link.basic import Container
 from pytensor.link.c.type import generic
 
 
-__SHARED_CONTEXT__: Optional[List[Variable]] = None
+_SHARED_CONTEXT: ContextVar[list[Variable] | None] = ContextVar(
+    "_SHARED_CONTEXT", default=None
+)
+
+
+def _copy_value(value):
+    """Return a deep copy of `value`, bypassing `deepcopy` for plain arrays.
+
+    `ndarray.copy` is a single buffer copy, whereas `deepcopy` goes
+    through the generic memo/`__reduce_ex__` machinery.  Arrays holding
+    Python objects still need `deepcopy` so that their elements are
+    copied too.
+
+    """
+    if isinstance(value, np.ndarray) and not value.dtype.hasobject:
+        return value.copy(order="K")
+    return deepcopy(value)
 
 
 @contextmanager
 def collect_new_shareds():
     r"""Return all the `SharedVariable`\s created within this context manager."""
-    global __SHARED_CONTEXT__
-    old_context = __SHARED_CONTEXT__
     context = []
+    token = _SHARED_CONTEXT.set(context)
     try:
-        __SHARED_CONTEXT__ = context
         yield context
     finally:
-        __SHARED_CONTEXT__ = old_context
+        _SHARED_CONTEXT.reset(token)
 
 
 class SharedVariable(Variable):
@@ -98,10 +115,9 @@ class SharedVariable(Variable):
                 allow_downcast=allow_downcast,
             )
 
-        global __SHARED_CONTEXT__
-
-        if isinstance(__SHARED_CONTEXT__, list):
-            __SHARED_CONTEXT__.append(self)
+        context = _SHARED_CONTEXT.get()
+        if context is not None:
+            context.append(self)
 
     def get_value(self, borrow=False, return_internal_type=False):
         """
@@ -124,7 +140,7 @@ class SharedVariable(Variable):
         if borrow:
             return self.container.value
         else:
-            return copy.deepcopy(self.container.value)
+            return _copy_value(self.container.value)
 
     def set_value(self, new_value, borrow=False):
         """
@@ -142,7 +158,7 @@ class SharedVariable(Variable):
         if borrow:
             self.container.value = new_value
         else:
-            self.container.value = copy.deepcopy(new_value)
+            self.container.value = _copy_value(new_value)
 
     def get_test_value(self):
         return self.get_value(borrow=True, return_internal_type=True)
@@ -165,7 +181,11 @@ class SharedVariable(Variable):
         if borrow:
             self.container.value[...] = 0
         else:
-            self.container.value = 0 * self.container.value
+            value = self.container.value
+            if isinstance(value, np.ndarray):
+                self.container.value = np.zeros_like(value)
+            else:
+                self.container.value = 0 * value
 
     def clone(self, **kwargs):
         name = kwargs.get("name", self.name)
@@ -176,7 +196,7 @@ class SharedVariable(Variable):
             strict=None,
             container=self.container,
         )
-        cp.tag = copy.copy(self.tag)
+        cp.tag = copy(self.tag)
         return cp
 
     def __getitem__(self, *args):
@@ -222,11 +242,33 @@ class SharedVariable(Variable):
     value = property(_value_get, _value_set)
 
 
-def shared_constructor(ctor, remove=False):
+def shared_constructor(ctor=None, remove=False, accepts=None):
+    """Register (or remove) a `SharedVariable` constructor used by `shared`.
+
+    Parameters
+    ----------
+    ctor
+        The constructor to register.  When omitted, a decorator is returned,
+        so that this can be used as ``@shared_constructor(accepts=...)``.
+    remove : bool
+        Remove `ctor` from the registered constructors instead.
+    accepts : callable, optional
+        A predicate called as ``accepts(value, **kwargs)`` with the extra
+        keyword arguments given to `shared`.  When it returns ``False``,
+        `ctor` is skipped without being called.  Constructors registered
+        without a predicate are always tried.
+
+    """
+    if ctor is None:
+        return partial(shared_constructor, remove=remove, accepts=accepts)
+
     if remove:
         shared.constructors.remove(ctor)
+        shared._accepts.pop(ctor, None)
     else:
         shared.constructors.append(ctor)
+        if accepts is not None:
+            shared._accepts[ctor] = accepts
     return ctor
 
 
@@ -263,6 +305,9 @@ def shared(value, name=None, strict=False, allow_downcast=None, **kwargs):
     This parameter allows you to create for example a `row` or `column` 2d
     tensor.
 
+    Constructors registered with an ``accepts`` predicate are skipped
+    without being called when the predicate rejects the value.
+
     """
 
     try:
@@ -273,6 +318,9 @@ def shared(value, name=None, strict=False, allow_downcast=None, **kwargs):
             )
 
         for ctor in reversed(shared.constructors):
+            accepts = shared._accepts.get(ctor)
+            if accepts is not None and not accepts(value, **kwargs):
+                continue
             try:
                 var = ctor(
                     value,
@@ -281,8 +329,6 @@ def shared(value, name=None, strict=False, allow_downcast=None, **kwargs):
                     allow_downcast=allow_downcast,
                     **kwargs,
                 )
-                add_tag_trace(var)
-                return var
             except TypeError:
                 continue
             # This may happen when kwargs were supplied
@@ -290,6 +336,8 @@ def shared(value, name=None, strict=False, allow_downcast=None, **kwargs):
             #
             # This was done on purpose, the rationale being that if kwargs
             # were supplied, the user didn't want them to be ignored.
+            add_tag_trace(var)
+            return var
 
     except MemoryError as e:
         e.args = e.args + ("Consider using `pytensor.shared(..., borrow=True)`",)
@@ -304,18 +352,35 @@ def shared(value, name=None, strict=False, allow_downcast=None, **kwargs):
 
 
 shared.constructors = []
+shared._accepts = {}
 
 
-@shared_constructor
+def _accepts_generic(value, **kwargs):
+    """Return whether `generic_constructor` can build a variable for `value`."""
+    return not kwargs
+
+
+@shared_constructor(accepts=_accepts_generic)
 def generic_constructor(value, name=None, strict=False, allow_downcast=None):
     """
     SharedVariable Constructor.
 
+    `generic` accepts any value as-is, so the container is built directly
+    instead of going through `Type.filter`.
+
     """
+    container = Container(
+        generic,
+        storage=[value],
+        readonly=False,
+        strict=strict,
+        allow_downcast=allow_downcast,
+        name=name,
+    )
     return SharedVariable(
         type=generic,
-        value=value,
+        value=None,
         name=name,
-        strict=strict,
-        allow_downcast=allow_downcast,
+        strict=None,
+        container=container,
     )
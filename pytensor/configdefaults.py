@@ -673,7 +673,7 @@ def add_tensor_configvars():
 def add_traceback_configvars():
     config.add(
         "traceback__limit",
-        "The number of stack to trace. -1 mean all.",
+        "The number of stack to trace. -1 mean all, 0 disables tracing.",
         # We default to a number to be able to know where v1 + v2 is created in the
         # user script. The bigger this number is, the more run time it takes.
         # We need to default to 8 to support pytensor.tensor.type.tensor(...).
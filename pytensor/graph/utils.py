@@ -87,7 +87,7 @@ def add_tag_trace(thing: T, user_line: Optional[int] = None) -> T:
     Notes
     -----
     We also use config.traceback__limit for the maximum number of stack level
-    we look.
+    we look.  With a limit of 0, the stack is not inspected at all.
 
     """
     from pytensor.configdefaults import config
@@ -95,6 +95,11 @@ def add_tag_trace(thing: T, user_line: Optional[int] = None) -> T:
     if user_line is None:
         user_line = config.traceback__limit
 
+    if user_line == 0:
+        # Tracing is disabled, so there is nothing to extract
+        thing.tag.trace = []
+        return thing
+
     if user_line == -1:
         user_line = None
     skips = [
@@ -61,6 +61,20 @@ class Container:
 
     """
 
+    # `required`, `implicit` and `provided` are set by `Function` on the
+    # containers of its inputs.
+    __slots__ = (
+        "type",
+        "name",
+        "storage",
+        "readonly",
+        "strict",
+        "allow_downcast",
+        "required",
+        "implicit",
+        "provided",
+    )
+
     def __init__(
         self,
         r: Union[Variable, Type],
@@ -106,13 +120,17 @@ class Container:
             if self.allow_downcast is not None:
                 kwargs["allow_downcast"] = self.allow_downcast
 
-            try:
-                # Use in-place filtering when/if possible
-                self.storage[0] = self.type.filter_inplace(
-                    value, self.storage[0], **kwargs
-                )
-            except NotImplementedError:
-                self.storage[0] = self.type.filter(value, **kwargs)
+            # Use in-place filtering when/if possible.  Most types don't
+            # implement it, so avoid raising `NotImplementedError` for them.
+            if type(self.type).filter_inplace is not Type.filter_inplace:
+                try:
+                    self.storage[0] = self.type.filter_inplace(
+                        value, self.storage[0], **kwargs
+                    )
+                    return
+                except NotImplementedError:
+                    pass
+            self.storage[0] = self.type.filter(value, **kwargs)
 
         except Exception as e:
             e.args = e.args + (f'Container name "{self.name}"',)
@@ -127,6 +145,15 @@ class Container:
     def __repr__(self):
         return "<" + repr(self.storage[0]) + ">"
 
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            name: getattr(self, name) for name in self.__slots__ if hasattr(self, name)
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __deepcopy__(self, memo: Dict[int, Any]) -> "Container":
         data_was_in_memo = id(self.storage[0]) in memo
         r = type(self)(
@@ -11,11 +11,16 @@ class SparseTensorSharedVariable(_sparse_py_operators, SharedVariable):
     format = property(lambda self: self.type.format)
 
 
-@shared_constructor
+def _accepts_sparse(value, **kwargs):
+    """Return whether `sparse_constructor` can build a variable for `value`."""
+    return isinstance(value, scipy.sparse.spmatrix)
+
+
+@shared_constructor(accepts=_accepts_sparse)
 def sparse_constructor(
     value, name=None, strict=False, allow_downcast=None, borrow=False, format=None
 ):
-    if not isinstance(value, scipy.sparse.spmatrix):
+    if not _accepts_sparse(value):
         raise TypeError(
             "Expected a sparse matrix in the sparse shared variable constructor. Received: ",
             value.__class__,
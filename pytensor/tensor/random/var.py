@@ -18,19 +18,25 @@ class RandomGeneratorSharedVariable(SharedVariable):
         )
 
 
-@shared_constructor
+def _accepts_rng(value, **kwargs):
+    """Return whether `randomgen_constructor` can build a variable for `value`."""
+    return isinstance(value, (np.random.RandomState, np.random.Generator))
+
+
+@shared_constructor(accepts=_accepts_rng)
 def randomgen_constructor(
     value, name=None, strict=False, allow_downcast=None, borrow=False
 ):
     r"""`SharedVariable` Constructor for NumPy's `Generator` and/or `RandomState`."""
+    if not _accepts_rng(value):
+        raise TypeError()
+
     if isinstance(value, np.random.RandomState):
         rng_sv_type = RandomStateSharedVariable
         rng_type = random_state_type
-    elif isinstance(value, np.random.Generator):
+    else:
         rng_sv_type = RandomGeneratorSharedVariable
         rng_type = random_generator_type
-    else:
-        raise TypeError()
 
     if not borrow:
         value = copy.deepcopy(value)
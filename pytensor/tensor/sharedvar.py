@@ -4,7 +4,6 @@ import warnings
 import numpy as np
 
 from pytensor.compile import SharedVariable, shared_constructor
-from pytensor.misc.safe_asarray import _asarray
 from pytensor.tensor import _get_vector_length
 from pytensor.tensor.type import TensorType
 from pytensor.tensor.var import _tensor_py_operators
@@ -30,7 +29,12 @@ def _get_vector_length_TensorSharedVariable(var_inst, var):
     return len(var.get_value(borrow=True))
 
 
-@shared_constructor
+def _accepts_tensor(value, target="cpu", **kwargs):
+    """Return whether `tensor_constructor` can build a variable for `value`."""
+    return target == "cpu" and isinstance(value, np.ndarray)
+
+
+@shared_constructor(accepts=_accepts_tensor)
 def tensor_constructor(
     value,
     name=None,
@@ -58,10 +62,7 @@ def tensor_constructor(
         )
         shape = broadcastable
 
-    if target != "cpu":
-        raise TypeError("not for cpu")
-
-    if not isinstance(value, np.ndarray):
+    if not _accepts_tensor(value, target=target):
         raise TypeError()
 
     # if no shape is given, then the default is to assume that
@@ -90,7 +91,12 @@ class ScalarSharedVariable(_tensor_py_operators, SharedVariable):
     pass
 
 
-@shared_constructor
+def _accepts_scalar(value, target="cpu", **kwargs):
+    """Return whether `scalar_constructor` can build a variable for `value`."""
+    return target == "cpu" and isinstance(value, (np.number, float, int, complex))
+
+
+@shared_constructor(accepts=_accepts_scalar)
 def scalar_constructor(
     value, name=None, strict=False, allow_downcast=None, borrow=False, target="cpu"
 ):
@@ -106,26 +112,18 @@ def scalar_constructor(
     borrow, as it is a hint to PyTensor that we can reuse it.
 
     """
-    if target != "cpu":
-        raise TypeError("not for cpu")
-
-    if not isinstance(value, (np.number, float, int, complex)):
+    if not _accepts_scalar(value, target=target):
         raise TypeError()
-    try:
-        dtype = value.dtype
-    except Exception:
-        dtype = np.asarray(value).dtype
 
-    dtype = str(dtype)
-    value = _asarray(value, dtype=dtype)
+    # `value` is a scalar, so this always creates a new 0-d array that we can
+    # own without copying it again.
+    value = np.asarray(value)
     tensor_type = TensorType(dtype=str(value.dtype), shape=[])
 
     try:
-        # Do not pass the dtype to asarray because we want this to fail if
-        # strict is True and the types do not match.
         rval = ScalarSharedVariable(
             type=tensor_type,
-            value=np.array(value, copy=True),
+            value=value,
             name=name,
             strict=strict,
             allow_downcast=allow_downcast,
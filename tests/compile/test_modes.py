@@ -4,43 +4,64 @@ Test compilation modes
 
 import copy
 
+import pytest
+
+from pytensor.compile.debugmode import _DummyLinker
 from pytensor.compile.function import function
 from pytensor.compile.mode import Mode, get_default_mode
 from pytensor.configdefaults import config
+from pytensor.link.basic import PerformLinker
+from pytensor.link.c.basic import OpWiseCLinker
+from pytensor.link.vm import VMLinker
 from pytensor.tensor.type import matrix, vector
 
 
 class TestBunchOfModes:
-    def test_modes(self):
-        # this is a quick test after the LazyLinker branch merge
-        # to check that all the current modes can still be used.
-        linker_classes_involved = []
-
-        predef_modes = ["FAST_COMPILE", "FAST_RUN", "DEBUG_MODE"]
-
-        # Linkers to use with regular Mode
-        if config.cxx:
-            linkers = ["py", "c|py", "c|py_nogc", "vm", "vm_nogc", "cvm", "cvm_nogc"]
-        else:
-            linkers = ["py", "c|py", "c|py_nogc", "vm", "vm_nogc"]
-        modes = predef_modes + [Mode(linker, "fast_run") for linker in linkers]
-
-        for mode in modes:
-            x = matrix()
-            y = vector()
-            f = function([x, y], x + y, mode=mode)
-            # test that it runs something
-            f([[1, 2], [3, 4]], [5, 6])
-            linker_classes_involved.append(f.maker.mode.linker.__class__)
-            # print 'MODE:', mode, f.maker.mode.linker, 'stop'
-
-        # regression check:
-        # there should be
-        # - `VMLinker`
-        # - OpWiseCLinker (FAST_RUN)
-        # - PerformLinker (FAST_COMPILE)
-        # - DebugMode's Linker  (DEBUG_MODE)
-        assert 4 == len(set(linker_classes_involved))
+    # This is a quick test after the LazyLinker branch merge
+    # to check that all the current modes can still be used.
+
+    def check_mode(self, mode, linker_class):
+        x = matrix()
+        y = vector()
+        f = function([x, y], x + y, mode=mode)
+        # test that it runs something
+        f([[1, 2], [3, 4]], [5, 6])
+        # regression check: each mode must still use the expected linker
+        assert type(f.maker.mode.linker) is linker_class
+
+    @pytest.mark.parametrize(
+        "mode, linker_class",
+        [
+            ("FAST_COMPILE", VMLinker),
+            ("FAST_RUN", VMLinker),
+            ("DEBUG_MODE", _DummyLinker),
+        ],
+    )
+    def test_predef_modes(self, mode, linker_class):
+        self.check_mode(mode, linker_class)
+
+    @pytest.mark.parametrize(
+        "linker, linker_class",
+        [
+            ("py", PerformLinker),
+            ("c|py", OpWiseCLinker),
+            ("c|py_nogc", OpWiseCLinker),
+            ("vm", VMLinker),
+            ("vm_nogc", VMLinker),
+            pytest.param(
+                "cvm",
+                VMLinker,
+                marks=pytest.mark.skipif(not config.cxx, reason="Need cxx"),
+            ),
+            pytest.param(
+                "cvm_nogc",
+                VMLinker,
+                marks=pytest.mark.skipif(not config.cxx, reason="Need cxx"),
+            ),
+        ],
+    )
+    def test_modes(self, linker, linker_class):
+        self.check_mode(Mode(linker, "fast_run"), linker_class)
 
 
 class TestOldModesProblem:
@@ -1,8 +1,17 @@
+import copy
+import pickle
+import threading
+
 import numpy as np
 import pytest
 
 import pytensor.tensor
-from pytensor.compile.sharedvalue import SharedVariable, shared
+from pytensor.compile.sharedvalue import (
+    SharedVariable,
+    collect_new_shareds,
+    shared,
+    shared_constructor,
+)
 from pytensor.configdefaults import config
 from pytensor.link.c.type import generic
 from pytensor.misc.safe_asarray import _asarray
@@ -34,6 +43,13 @@ class TestSharedVariable:
         assert shared(7.0).type == dscalar
         assert shared(np.float32(7)).type == fscalar
 
+        # Shared variables hold mutable state, so equal scalars must not be
+        # shared between calls
+        a, b = shared(7.0), shared(7.0)
+        assert a is not b
+        a.set_value(8.0)
+        assert b.get_value() == 7.0
+
         # test tensor constructor
         b = shared(np.zeros((5, 5), dtype="int32"))
         assert b.type == TensorType("int32", shape=(None, None))
@@ -61,6 +77,12 @@ class TestSharedVariable:
         u.set_value(88)
         v.set_value(88)
 
+        value = {"a": 1}
+        w = shared(value, name="w")
+        assert type(w) is SharedVariable
+        assert w.get_value(borrow=True) is value
+        assert w.container.name == "w"
+
     def test_create_numpy_strict_false(self):
 
         # here the value is perfect, and we're not strict about it,
@@ -343,3 +365,146 @@ class TestSharedVariable:
     def test_err_symbolic_variable(self):
         with pytest.raises(TypeError):
             shared(pytensor.tensor.ones((2, 3)))
+
+    def test_get_set_value_copy(self):
+        x = np.asfortranarray(np.arange(6.0).reshape((2, 3)))
+        s = shared(x)
+
+        res = s.get_value()
+        assert res is not s.get_value(borrow=True)
+        assert not np.may_share_memory(res, s.get_value(borrow=True))
+        assert res.flags["F_CONTIGUOUS"]
+        assert np.array_equal(res, x)
+
+        s.set_value(x)
+        assert not np.may_share_memory(s.get_value(borrow=True), x)
+        x[0, 0] = -1
+        assert s.get_value()[0, 0] == 0
+
+        # Object arrays still get their elements copied
+        o = np.empty((1,), dtype=object)
+        o[0] = [1]
+        g = shared(o)
+        assert g.get_value()[0] is not o[0]
+
+    def test_zero(self):
+        x = np.arange(6.0, dtype="float32").reshape((2, 3))
+        s = shared(x, borrow=True)
+
+        s.zero()
+        res = s.get_value(borrow=True)
+        assert res is not x
+        assert res.dtype == x.dtype
+        assert not res.any()
+        assert x.any()
+
+        s.set_value(x, borrow=True)
+        s.zero(borrow=True)
+        assert s.get_value(borrow=True) is x
+        assert not x.any()
+
+        s = shared(np.float64(3.0))
+        s.zero()
+        assert s.get_value() == 0
+
+    @pytest.mark.parametrize("use_accepts", [False, True])
+    def test_constructor_tried_for_each_value(self, use_accepts):
+        # A constructor that rejected an earlier value of the same type, by
+        # raising a TypeError or through its `accepts` predicate, must still be
+        # tried for the next one
+        calls = []
+
+        def is_odd(value, **kwargs):
+            return isinstance(value, int) and value % 2 == 1
+
+        def odd_constructor(value, name=None, strict=False, allow_downcast=None):
+            calls.append(value)
+            if not is_odd(value):
+                raise TypeError()
+            return SharedVariable(type=generic, value=value, name=name, strict=strict)
+
+        shared_constructor(odd_constructor, accepts=is_odd if use_accepts else None)
+        try:
+            assert shared(2).type != generic
+            assert shared(3).type == generic
+            assert shared(4).type != generic
+            # Rejecting predicates keep the constructor from being called
+            assert calls == ([3] if use_accepts else [2, 3, 4])
+        finally:
+            shared_constructor(odd_constructor, remove=True)
+
+        assert shared(3).type != generic
+
+    def test_constructor_accepts(self):
+        calls = []
+
+        def str_constructor(value, name=None, strict=False, allow_downcast=None):
+            calls.append(value)
+            return SharedVariable(type=generic, value=value, name=name, strict=strict)
+
+        shared_constructor(
+            str_constructor, accepts=lambda value, **kwargs: isinstance(value, str)
+        )
+        try:
+            assert shared(np.zeros(2)).type != generic
+            assert shared(2.0).type != generic
+            assert calls == []
+
+            assert shared("a").type == generic
+            assert calls == ["a"]
+        finally:
+            shared_constructor(str_constructor, remove=True)
+
+        assert str_constructor not in shared._accepts
+
+    def test_pickle(self):
+        s = shared(np.arange(3.0), name="s")
+        s.default_update = s + 1
+        s.tag.foo = "bar"
+
+        s2 = pickle.loads(pickle.dumps(s))
+        assert s2.name == "s"
+        assert s2.tag.foo == "bar"
+        assert np.array_equal(s2.get_value(), np.arange(3.0))
+        assert s2.default_update.owner.inputs[0] is s2
+
+        s3 = copy.copy(shared(1.0))
+        assert not hasattr(s3, "default_update")
+        assert s3.get_value() == 1.0
+
+
+def test_collect_new_shareds():
+    with collect_new_shareds() as outer:
+        a = shared(1.0)
+        with collect_new_shareds() as inner:
+            b = shared(2.0)
+
+            # Variables created in another thread are not collected here
+            thread = threading.Thread(target=shared, args=(3.0,))
+            thread.start()
+            thread.join()
+        c = shared(4.0)
+
+    shared(5.0)
+    assert inner == [b]
+    assert outer == [a, c]
+
+
+def test_clone_tag():
+    x = SharedVariable(
+        name="x",
+        type=TensorType("float64", shape=(None,)),
+        value=np.zeros(2),
+        strict=False,
+    )
+    y = x.clone()
+    assert y.container is x.container
+    assert y.tag is not x.tag
+
+    x.tag.test_value = np.ones(2)
+    z = x.clone(name="z")
+    assert z.name == "z"
+    assert np.array_equal(z.tag.test_value, np.ones(2))
+
+    s = shared(1.0)
+    assert s.clone().tag.trace == s.tag.trace
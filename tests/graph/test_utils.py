@@ -12,3 +12,9 @@ def test_stack_trace():
         v = vector()
         assert len(v.tag.trace) == 1
         assert len(v.tag.trace[0]) == 2
+
+    with pytensor.config.change_flags(traceback__limit=0):
+        v = vector()
+        assert v.tag.trace == []
+        s = pytensor.shared(1.0)
+        assert s.tag.trace == []
@@ -1,3 +1,4 @@
+import pickle
 from copy import deepcopy
 from typing import Callable
 
@@ -257,3 +258,35 @@ def test_container_deepcopy():
         assert isinstance(d.storage[0], np.ndarray), (d.storage[0], type(d.storage[0]))
         assert d.storage[0].dtype == v.dtype, (d.storage[0].dtype, v.dtype)
         assert d.storage[0].dtype == c.type.dtype, (d.storage[0].dtype, c.type.dtype)
+
+
+def test_container_pickle():
+    t = scalar()
+    v = np.asarray(0.0, dtype=pytensor.config.floatX)
+    c = Container(t, [v], readonly=True, name="c")
+    c.provided = 1
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        d = pickle.loads(pickle.dumps(c, protocol=protocol))
+        assert d.type == c.type
+        assert d.name == "c"
+        assert d.readonly
+        assert d.provided == 1
+        assert not hasattr(d, "required")
+        assert d.storage[0] == v
+
+
+def test_container_filter_inplace():
+    class TInplace(TDouble):
+        def filter_inplace(self, value, storage, strict=False, allow_downcast=None):
+            storage[:] = value
+            return storage
+
+    buf = [0.0]
+    c = Container(TInplace(), [buf])
+    c.value = [2.0]
+    assert c.value is buf
+    assert buf == [2.0]
+
+    c = Container(TDouble(), [None])
+    c.value = 3
+    assert c.value == 3.0